@@ -0,0 +1,315 @@
+# ---------------------------------------------------------------------------- #
+#                                  Importações                                 #
+# ---------------------------------------------------------------------------- #
+
+import os
+import numpy as np
+import matplotlib.pyplot as plt
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Constantes                                 #
+# ---------------------------------------------------------------------------- #
+
+# Colunas populacionais de `dadosConcentracao.csv` (a coluna 0 é o tempo):
+ESPECIES = ('Rato', 'Coelho', 'Gato', 'Leao')
+ROTULOS = ('Presa 1 (z)', 'Presa 2 (w)', 'Predador 1 (y)', 'Predador 2 (x)')
+CORES = ('grey', 'red', 'orange', 'brown')
+
+# Índice de cada espécie na solução de `lotkaVolterra` (u = [x, y, z, w]):
+COLUNAS_CAMPO_MEDIO = (2, 3, 1, 0)
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Funções                                   #
+# ---------------------------------------------------------------------------- #
+
+# --------------------------------- Leitura ---------------------------------- #
+
+def carregaExecucao(caminho:str, cache:bool=True):
+    '''
+    Abre a saída de uma execução como um array mapeado em memória.
+
+    Na primeira leitura o CSV é convertido para um arquivo `.npy` ao lado dele;
+    as leituras seguintes abrem esse arquivo com `mmap_mode='r'`, sem copiar os
+    dados para a memória. O cache é refeito sempre que o CSV for mais novo.
+
+    Args:
+        caminho (str): caminho do CSV gerado por `exportarDados`
+        cache (bool, optional): falso para apenas ler o CSV, sem gravar o
+    `.npy`. Verdadeiro por padrão
+
+    Returns:
+        (np.ndarray): array (linhas, colunas) em float64, somente leitura
+    '''
+    caminhoCache = os.path.splitext(caminho)[0] + '.npy'
+    atualizado = (os.path.exists(caminhoCache) and
+                  os.path.getmtime(caminhoCache) >= os.path.getmtime(caminho))
+    if not atualizado:
+        dados = np.loadtxt(caminho, delimiter=',', ndmin=2, dtype=np.float64)
+        if not cache: return dados
+        np.save(caminhoCache, dados)
+    return np.load(caminhoCache, mmap_mode='r')
+
+
+def empilhaExecucoes(caminhos:list, destino:str):
+    '''
+    Junta as populações de várias execuções em um único array 3D gravado em
+    disco e devolvido mapeado em memória.
+
+    Execuções mais curtas são completadas com NaN. O tempo é o índice da linha
+    (frame): a coluna de tempo gravada por `exportarDados` repete os frames,
+    pois `listaTempo` é compartilhada entre `listaConc` e `listaInf`.
+
+    Args:
+        caminhos (list): caminhos dos CSVs de concentração de cada execução
+        destino (str): caminho do `.npy` a ser criado
+
+    Returns:
+        (np.memmap): array (execuções, frames, espécies), somente leitura
+    '''
+    execucoes = [carregaExecucao(caminho) for caminho in caminhos]
+    nFrames = max(len(dados) for dados in execucoes)
+    nEspecies = execucoes[0].shape[1] - 1
+    ensemble = np.lib.format.open_memmap(destino, mode='w+', dtype=np.float64,
+                                         shape=(len(execucoes), nFrames,
+                                                nEspecies))
+    for k, dados in enumerate(execucoes):
+        ensemble[k, :len(dados)] = dados[:, 1:]
+        ensemble[k, len(dados):] = np.nan
+    ensemble.flush()
+    del ensemble
+    return np.load(destino, mmap_mode='r')
+
+
+# -------------------------------- Estatística ------------------------------- #
+
+def estatisticasEnsemble(ensemble:np.ndarray, bloco:int=4096):
+    '''
+    Calcula média, desvio padrão, mínimo e máximo entre as execuções, frame a
+    frame. O cálculo é feito em blocos de frames para que o ensemble inteiro
+    nunca precise estar na memória.
+
+    Args:
+        ensemble (np.ndarray): array (execuções, frames, espécies)
+        bloco (int, optional): número de frames processados por vez. 4096 por
+    padrão
+
+    Returns:
+        (dict): arrays (frames, espécies) em 'media', 'desvio', 'minimo' e
+    'maximo', e o número de execuções ainda ativas por frame em 'n'
+    '''
+    _, nFrames, nEspecies = ensemble.shape
+    estat = {chave: np.empty((nFrames, nEspecies))
+             for chave in ('media', 'desvio', 'minimo', 'maximo')}
+    estat['n'] = np.empty(nFrames, dtype=np.int64)
+    for inicio in range(0, nFrames, bloco):
+        fatia = slice(inicio, inicio+bloco)
+        dados = np.asarray(ensemble[:, fatia])
+        validos = ~np.isnan(dados)
+        n = validos.sum(axis=0)
+        soma = np.where(validos, dados, 0).sum(axis=0)
+        media = soma/np.maximum(n, 1)
+        desvio = np.where(validos, dados-media, 0)
+        estat['media'][fatia] = np.where(n > 0, media, np.nan)
+        estat['desvio'][fatia] = np.where(n > 0,
+            np.sqrt((desvio**2).sum(axis=0)/np.maximum(n, 1)), np.nan)
+        estat['minimo'][fatia] = np.where(validos, dados, np.inf).min(axis=0)
+        estat['maximo'][fatia] = np.where(validos, dados, -np.inf).max(axis=0)
+        estat['n'][fatia] = n[:, 0]
+    return estat
+
+
+def estimaPeriodo(ensemble:np.ndarray, dt:float=1., bloco:int=8):
+    '''
+    Estima o período e a fase dominantes de cada espécie em cada execução a
+    partir do pico do espectro de Fourier.
+
+    Cada execução usa todo o seu comprimento válido; execuções de mesmo
+    comprimento são transformadas juntas, em grupos de até `bloco` execuções
+    para que o ensemble inteiro nunca precise estar na memória. A tendência
+    linear de cada série é removida antes da transformada, para que uma
+    população em queda não apareça como uma oscilação do tamanho da janela.
+
+    Args:
+        ensemble (np.ndarray): array (execuções, frames, espécies)
+        dt (float, optional): intervalo de tempo entre frames. 1 por padrão
+        bloco (int, optional): número de execuções processadas por vez. 8 por
+    padrão
+
+    Returns:
+        (np.ndarray, np.ndarray): período e fase (em radianos), ambos com
+    formato (execuções, espécies). São NaN quando não há oscilação
+    resolvível: séries constantes ou lineares, séries curtas demais e picos no
+    primeiro harmônico da janela (período maior que a própria execução)
+    '''
+    nExecucoes, _, nEspecies = ensemble.shape
+    comprimentos = (~np.isnan(ensemble[:, :, 0])).sum(axis=1)
+    periodo = np.full((nExecucoes, nEspecies), np.nan)
+    fase = np.full((nExecucoes, nEspecies), np.nan)
+    for comprimento in np.unique(comprimentos):
+        # São necessários pelo menos os harmônicos 0, 1 e 2:
+        if (comprimento < 4): continue
+        t = np.arange(comprimento) - (comprimento-1)/2
+        freqs = np.fft.rfftfreq(comprimento, d=dt)
+        grupo = np.nonzero(comprimentos == comprimento)[0]
+        for inicio in range(0, len(grupo), bloco):
+            execucoes = grupo[inicio:inicio+bloco]
+            dados = np.asarray(ensemble[execucoes, :comprimento])
+            # Remove a tendência linear:
+            dados = dados - dados.mean(axis=1, keepdims=True)
+            inclinacao = (t[:, None]*dados).sum(axis=1)/(t**2).sum()
+            dados -= inclinacao[:, None, :]*t[:, None]
+            espectro = np.fft.rfft(dados, axis=1)
+            del dados
+            # Ignora a componente constante:
+            pico = np.abs(espectro[:, 1:]).argmax(axis=1) + 1
+            amplitude = np.take_along_axis(espectro, pico[:, None],
+                                           axis=1)[:, 0]
+            resolvivel = (pico > 1) & (np.abs(amplitude) > 1e-8*comprimento)
+            periodo[execucoes] = np.where(resolvivel, 1/freqs[pico], np.nan)
+            fase[execucoes] = np.where(resolvivel, np.angle(amplitude),
+                                       np.nan)
+    return periodo, fase
+
+
+# -------------------------------- Campo médio ------------------------------- #
+
+def rungeKutta(f, u0:np.ndarray, t:np.ndarray, h:float, *args):
+    '''
+    Integra o sistema u' = f(t, u) pelo método de Runge-Kutta de quarta ordem.
+
+    Args:
+        f (function): lado direito do sistema, f(t, u, *args)
+        u0 (np.ndarray): condição inicial
+        t (np.ndarray): instantes de tempo
+        h (float): passo de tempo
+
+    Returns:
+        (np.ndarray): solução (len(t), len(u0))
+    '''
+    u = u0
+    result = [u0]
+    for ti in t[1:]:
+        k1 = h * f(ti, u, *args)
+        k2 = h * f(ti + h / 2, u + k1 / 2, *args)
+        k3 = h * f(ti + h / 2, u + k2 / 2, *args)
+        k4 = h * f(ti + h, u + k3, *args)
+        u = u + (k1 + 2 * k2 + 2 * k3 + k4) / 6
+        result.append(u)
+    return np.array(result)
+
+
+def lotkaVolterra(t, u, alpha, beta, A, phi, lambd, gamma, D, psi, E, F):
+    '''
+    Equações de Lotka-Volterra do modelo de campo médio, u = [x, y, z, w].
+    '''
+    x, y, z, w = u
+    xdot = alpha * x * y - beta * x * y - A * x
+    ydot = -alpha * y * x - phi * y * z + lambd * y * z + gamma * y * w - D * y
+    zdot = -lambd * z * y - psi * z + E * z
+    wdot = -gamma * w * y + F * w
+    return np.array([xdot, ydot, zdot, wdot])
+
+
+def erroCampoMedio(ensemble:np.ndarray, solucao:np.ndarray,
+                   tSolucao:np.ndarray, escalaTempo:float=None,
+                   colunas:tuple=COLUNAS_CAMPO_MEDIO, bloco:int=4096):
+    '''
+    Calcula o erro quadrático médio entre cada execução e a solução de campo
+    médio.
+
+    Como a simulação conta indivíduos e a solução é adimensional, ambas são
+    normalizadas pelo seu valor inicial antes da comparação.
+
+    Args:
+        ensemble (np.ndarray): array (execuções, frames, espécies)
+        solucao (np.ndarray): solução (len(tSolucao), 4) de `rungeKutta`
+        tSolucao (np.ndarray): instantes de tempo da solução
+        escalaTempo (float, optional): frames por unidade de tempo da
+    solução. Por padrão, o ensemble inteiro é esticado sobre tSolucao
+        colunas (tuple, optional): coluna da solução correspondente a cada
+    espécie do ensemble
+        bloco (int, optional): número de frames processados por vez. 4096 por
+    padrão
+
+    Returns:
+        (np.ndarray): erro (execuções, espécies)
+    '''
+    nExecucoes, nFrames, nEspecies = ensemble.shape
+    if escalaTempo is None:
+        escalaTempo = (nFrames-1)/(tSolucao[-1]-tSolucao[0])
+    tFrames = tSolucao[0] + np.arange(nFrames)/escalaTempo
+    referencia = np.stack([np.interp(tFrames, tSolucao, solucao[:, c])
+                           / solucao[0, c] for c in colunas], axis=1)
+    inicial = np.asarray(ensemble[:, 0])
+    inicial = np.where(inicial > 0, inicial, np.nan)[:, None]
+    soma = np.zeros((nExecucoes, nEspecies))
+    n = np.zeros((nExecucoes, nEspecies))
+    for inicio in range(0, nFrames, bloco):
+        fatia = slice(inicio, inicio+bloco)
+        dif = np.asarray(ensemble[:, fatia])/inicial - referencia[fatia]
+        validos = ~np.isnan(dif)
+        soma += np.where(validos, dif**2, 0).sum(axis=1)
+        n += validos.sum(axis=1)
+    return np.sqrt(soma/np.where(n > 0, n, np.nan))
+
+
+# ---------------------------------- Visual ---------------------------------- #
+
+def decima(y:np.ndarray, maxPontos:int=2000):
+    '''
+    Reduz uma série para no máximo `maxPontos` pontos mantendo o mínimo e o
+    máximo de cada intervalo, para que picos não desapareçam no gráfico.
+
+    Args:
+        y (np.ndarray): série (frames,)
+        maxPontos (int, optional): número máximo de pontos. 2000 por padrão
+
+    Returns:
+        (np.ndarray): índices dos frames escolhidos, em ordem crescente
+    '''
+    nFrames = len(y)
+    if nFrames <= maxPontos:
+        return np.arange(nFrames)
+    tamanho = -(-2*nFrames // maxPontos)
+    nBlocos = -(-nFrames // tamanho)
+    blocos = np.full(nBlocos*tamanho, np.nan)
+    blocos[:nFrames] = y
+    blocos = blocos.reshape(nBlocos, tamanho)
+    inicio = np.arange(nBlocos)*tamanho
+    argMin = np.nanargmin(np.where(np.isnan(blocos), np.inf, blocos), axis=1)
+    argMax = np.nanargmax(np.where(np.isnan(blocos), -np.inf, blocos), axis=1)
+    frames = np.concatenate([argMin+inicio, argMax+inicio])
+    return np.unique(np.minimum(frames, nFrames-1))
+
+
+def plotaEnsemble(estat:dict, maxPontos:int=2000, ax=None):
+    '''
+    Plota a média do ensemble com a faixa de um desvio padrão, reduzindo cada
+    série com `decima` antes de desenhar.
+
+    Args:
+        estat (dict): resultado de `estatisticasEnsemble`
+        maxPontos (int, optional): número máximo de pontos por série. 2000 por
+    padrão
+        ax (matplotlib Axes, optional): eixo onde desenhar. Por padrão cria uma
+    nova figura
+
+    Returns:
+        (matplotlib Axes): eixo com o gráfico
+    '''
+    if ax is None:
+        _, ax = plt.subplots(figsize=(8,5))
+    ax.set_title('Dinâmica das populações - Ensemble')
+    ax.set_xlabel('Tempo (Frames)')
+    ax.set_ylabel('Número de indivíduos')
+    for k, (rotulo, cor) in enumerate(zip(ROTULOS, CORES)):
+        media, desvio = estat['media'][:, k], estat['desvio'][:, k]
+        frames = decima(media, maxPontos)
+        ax.plot(frames, media[frames], label=rotulo, color=cor)
+        ax.fill_between(frames, media[frames]-desvio[frames],
+                        media[frames]+desvio[frames], color=cor, alpha=.2)
+    ax.legend(loc='best', fancybox=True, shadow=True)
+    ax.grid()
+    return ax
@@ -0,0 +1,740 @@
+# ---------------------------------------------------------------------------- #
+#                                  Importações                                 #
+# ---------------------------------------------------------------------------- #
+
+import os
+import warnings
+from copy import deepcopy
+from math import sqrt
+from random import Random
+from time import perf_counter
+import numpy as np
+import kernels
+import parametros
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Constantes                                 #
+# ---------------------------------------------------------------------------- #
+
+ESPECIES = tuple(parametros.propriedades)
+EVENTOS = ('infeccao', 'predacao', 'reproducao', 'morte')
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+
+class Estado:
+    '''
+    Estado da simulação sem interface gráfica. Cada atributo de indivíduo de
+    `main.Individuo` vira um array, de forma que os backends possam operar
+    sobre a população inteira. Só os `n` primeiros elementos são válidos.
+    '''
+    def __init__(self, propriedades:dict=None, capacidade:int=256):
+        self.propriedades = deepcopy(propriedades or parametros.propriedades)
+        dics = [self.propriedades[esp] for esp in ESPECIES]
+        self.raioEsp = np.array([dic['raio'] for dic in dics], dtype=float)
+        self.massaEsp = np.array([dic['massa'] for dic in dics], dtype=float)
+        self.taxaNat = np.array([dic['taxaNat'] for dic in dics])
+        self.taxaMort = np.array([dic['taxaMort'] for dic in dics])
+        self.taxaInf = np.array([dic['taxaInf'] for dic in dics])
+        self.taxaPred = np.array([dic['taxaPred'] for dic in dics])
+        # presa[a, b] é verdadeiro se a espécie a come a espécie b:
+        self.presa = np.zeros((len(ESPECIES), len(ESPECIES)), dtype=bool)
+        for pred, pres in parametros.combosPred:
+            self.presa[ESPECIES.index(pred), ESPECIES.index(pres)] = True
+        self.dt = parametros.dt
+        self.ladoCaixa = parametros.ladoCaixa
+        self.alcance = parametros.alcanceVizinhos
+
+        self.n = 0
+        self.pos = np.zeros((capacidade, 2))
+        self.vel = np.zeros((capacidade, 2))
+        self.raio = np.zeros(capacidade)
+        self.massa = np.zeros(capacidade)
+        self.especie = np.zeros(capacidade, dtype=np.int64)
+        self.saudavel = np.ones(capacidade, dtype=bool)
+        self.chanceMort = np.zeros(capacidade)
+        self.intCount = np.zeros(capacidade, dtype=np.int64)
+        self.morto = np.zeros(capacidade, dtype=bool)
+        # Equivalente a estar em `indInfectados` (infectado por contato):
+        self.listaInf = np.zeros(capacidade, dtype=bool)
+        self.numIndividuos = np.zeros(len(ESPECIES), dtype=np.int64)
+        self.numInfectados = np.zeros(len(ESPECIES), dtype=np.int64)
+        self.eventos = dict.fromkeys(EVENTOS, 0)
+
+
+    def reserva(self, capacidade:int):
+        '''
+        Garante espaço para pelo menos `capacidade` indivíduos.
+
+        Args:
+            capacidade (int): número mínimo de indivíduos
+        '''
+        atual = len(self.raio)
+        if (capacidade <= atual): return
+        nova = max(capacidade, 2*atual)
+        for nome in ('pos', 'vel', 'raio', 'massa', 'especie', 'saudavel',
+                     'chanceMort', 'intCount', 'morto', 'listaInf'):
+            antigo = getattr(self, nome)
+            array = np.zeros((nova,) + antigo.shape[1:], dtype=antigo.dtype)
+            array[:atual] = antigo
+            setattr(self, nome, array)
+        self.saudavel[atual:] = True
+
+
+    def criaIndividuo(self, pos, vel, especie:int, saudavel:bool=True):
+        '''
+        Acrescenta um indivíduo de uma determinada espécie ao estado.
+
+        Args:
+            pos (sequence): posição inicial (x, y) do indivíduo
+            vel (sequence): velocidade inicial (vx, vy) do indivíduo
+            especie (int): índice da espécie em ESPECIES
+            saudavel (bool): condição de infecção para o indivíduo;
+        Verdadeiro = saudável, Falso = infectado. Verdadeiro por padrão
+        '''
+        self.reserva(self.n+1)
+        k = self.n
+        self.pos[k], self.vel[k] = pos, vel
+        self.raio[k] = self.raioEsp[especie]
+        self.massa[k] = self.massaEsp[especie]
+        self.especie[k] = especie
+        self.saudavel[k] = saudavel
+        self.chanceMort[k] = self.taxaMort[especie]
+        self.intCount[k] = 0
+        self.morto[k] = False
+        self.listaInf[k] = False
+        if (not saudavel): self.numInfectados[especie] += 1
+        self.numIndividuos[especie] += 1
+        self.n += 1
+
+
+    def removeMortos(self):
+        '''
+        Deleta todos os indivíduos mortos, mantendo a ordem dos demais.
+        '''
+        n = self.n
+        vivos = ~self.morto[:n]
+        self.numIndividuos -= np.bincount(self.especie[:n][~vivos],
+                                          minlength=len(ESPECIES))
+        m = int(vivos.sum())
+        for nome in ('pos', 'vel', 'raio', 'massa', 'especie', 'saudavel',
+                     'chanceMort', 'intCount', 'morto', 'listaInf'):
+            array = getattr(self, nome)
+            array[:m] = array[:n][vivos]
+        self.n = m
+
+
+class Backend:
+    '''
+    Interface comum dos backends de cálculo. Cada backend guarda seu próprio
+    gerador de números aleatórios, semeado por `semeia`.
+
+    `passo` soma em `tempos` os segundos gastos em cada uma das `FASES`;
+    quem lê os tempos é quem os zera.
+    '''
+    nome = None
+    FASES = ('movimento', 'vizinhos', 'interacoes', 'paredes', 'infectados')
+
+    def __init__(self, semente:int=None):
+        self.tempos = dict.fromkeys(self.FASES, 0.)
+        self.semeia(semente)
+
+
+    def semeia(self, semente:int=None):
+        '''
+        Reinicia o gerador de números aleatórios do backend.
+
+        Args:
+            semente (int, optional): semente do gerador
+        '''
+        raise NotImplementedError
+
+
+    def colElastica(self, estado:Estado, i:np.ndarray, j:np.ndarray):
+        '''
+        Aplica colisões elásticas aos pares (i[k], j[k]), atualizando as
+        velocidades do estado. Determinístico.
+
+        Args:
+            estado (Estado): estado da simulação
+            i (np.ndarray): índices de um dos indivíduos de cada par
+            j (np.ndarray): índices do outro indivíduo de cada par
+        '''
+        raise NotImplementedError
+
+
+    def vizinhos(self, estado:Estado):
+        '''
+        Lista os pares (i, j), i != j, com j a até raio[i]+alcance de i, em
+        ordem crescente de i e depois de j. Determinístico.
+
+        Args:
+            estado (Estado): estado da simulação
+
+        Returns:
+            (np.ndarray, np.ndarray): índices i e j de cada par
+        '''
+        raise NotImplementedError
+
+
+    def passo(self, estado:Estado):
+        '''
+        Move os indivíduos e resolve colisões e interações de um frame, como o
+        laço de `main.step` (a remoção dos mortos fica a cargo de quem chama).
+
+        Args:
+            estado (Estado): estado da simulação
+        '''
+        raise NotImplementedError
+
+
+class BackendReferencia(Backend):
+    '''
+    Backend de referência: a lógica de `main.py`, indivíduo por indivíduo, em
+    Python puro e com o módulo `random`. Os sorteios são feitos na mesma ordem
+    que em `main.py`.
+    '''
+    nome = 'referencia'
+    FASES = ('conversao',) + Backend.FASES
+
+    def semeia(self, semente:int=None):
+        self.rng = Random(semente)
+
+
+    # ------------------------------- Conversão ------------------------------ #
+
+    def _carrega(self, estado:Estado):
+        n = estado.n
+        self.e = estado
+        self.P = estado.pos[:n].tolist()
+        self.V = estado.vel[:n].tolist()
+        self.R = estado.raio[:n].tolist()
+        self.M = estado.massa[:n].tolist()
+        self.E = estado.especie[:n].tolist()
+        self.S = estado.saudavel[:n].tolist()
+        self.C = estado.chanceMort[:n].tolist()
+        self.I = estado.intCount[:n].tolist()
+        self.D = estado.morto[:n].tolist()
+        self.L = estado.listaInf[:n].tolist()
+        self.taxaInf, self.taxaPred = (estado.taxaInf.tolist(),
+                                       estado.taxaPred.tolist())
+        self.taxaNat, self.presa = (estado.taxaNat.tolist(),
+                                    estado.presa.tolist())
+
+
+    def _descarrega(self):
+        e = self.e
+        n = len(self.P)
+        e.reserva(n)
+        e.pos[:n], e.vel[:n], e.raio[:n], e.massa[:n] = (self.P, self.V,
+                                                         self.R, self.M)
+        e.especie[:n], e.saudavel[:n], e.chanceMort[:n] = (self.E, self.S,
+                                                           self.C)
+        e.intCount[:n], e.morto[:n], e.listaInf[:n] = self.I, self.D, self.L
+        e.n = n
+        del self.e
+
+
+    # -------------------------------- Kernels ------------------------------- #
+
+    def colElastica(self, estado:Estado, i:np.ndarray, j:np.ndarray):
+        self._carrega(estado)
+        for a, b in zip(np.asarray(i).tolist(), np.asarray(j).tolist()):
+            self._colElastica(a, b)
+        self._descarrega()
+
+
+    def vizinhos(self, estado:Estado):
+        self._carrega(estado)
+        pares = [(a, b) for a in range(len(self.P))
+                 for b in self._atualizaVizinhos(a)]
+        self._descarrega()
+        i, j = np.array(pares, dtype=np.int64).reshape(-1, 2).T
+        return i, j
+
+
+    def passo(self, estado:Estado):
+        tempos, relogio = self.tempos, perf_counter
+        t0 = relogio()
+        self._carrega(estado)
+        tempos['conversao'] += relogio()-t0
+        movimento = vizinhanca = interacoes = paredes = 0.
+        a = 0
+        # Indivíduos nascidos no frame também são percorridos, como em main:
+        while (a < len(self.P)):
+            t0 = relogio()
+            self._atualizaPos(a)
+            t1 = relogio()
+            vizinhos = self._atualizaVizinhos(a)
+            t2 = relogio()
+            self._atualizaMort(a)
+            t3 = relogio()
+            for b in vizinhos:
+                self._colCheckIndInd(a, b)
+            t4 = relogio()
+            self._colCheckIndParede(a)
+            t5 = relogio()
+            movimento += (t1-t0) + (t3-t2)
+            vizinhanca += t2-t1
+            interacoes += t4-t3
+            paredes += t5-t4
+            a += 1
+        tempos['movimento'] += movimento
+        tempos['vizinhos'] += vizinhanca
+        tempos['interacoes'] += interacoes
+        tempos['paredes'] += paredes
+        t0 = relogio()
+        for a in range(len(self.P)):
+            if self.L[a]: self._atualizaInf(a)
+        t1 = relogio()
+        self._descarrega()
+        tempos['infectados'] += t1-t0
+        tempos['conversao'] += relogio()-t1
+
+
+    # -------------------------------- Dinâmica ------------------------------ #
+
+    def _dist(self, x1, y1, x2, y2):
+        dx, dy = x1-x2, y1-y2
+        return sqrt(dx*dx + dy*dy)
+
+
+    def _colInelastica(self, a:int, b:int):
+        (x1, y1), (vx1, vy1), m1 = self.P[a], self.V[a], self.M[a]
+        (x2, y2), (vx2, vy2), m2 = self.P[b], self.V[b], self.M[b]
+        m_ = (m1+m2)/2
+        v_ = [(m1*vx1+m2*vx2)/m_, (m1*vy1+m2*vy2)/m_]
+        x_ = [(x1+x2)/2, (y1+y2)/2]
+        return x_, v_
+
+
+    def _colElastica(self, a:int, b:int):
+        (x1, y1), (vx1, vy1), m1 = self.P[a], self.V[a], self.M[a]
+        (x2, y2), (vx2, vy2), m2 = self.P[b], self.V[b], self.M[b]
+        dx1, dy1, dx2, dy2 = x1-x2, y1-y2, x2-x1, y2-y1
+        k1 = ((2*m2)/(m1+m2))*(((vx1-vx2)*dx1 + (vy1-vy2)*dy1)
+                               /(dx1*dx1 + dy1*dy1))
+        k2 = ((2*m1)/(m1+m2))*(((vx2-vx1)*dx2 + (vy2-vy1)*dy2)
+                               /(dx2*dx2 + dy2*dy2))
+        self.V[a] = [vx1 - k1*dx1, vy1 - k1*dy1]
+        self.V[b] = [vx2 - k2*dx2, vy2 - k2*dy2]
+
+
+    def _infeccao(self, infect:int, sus:int):
+        self._colElastica(infect, sus)
+        self.S[sus] = False
+        self.e.numInfectados[self.E[sus]] += 1
+        self.L[sus] = True
+        self.e.eventos['infeccao'] += 1
+
+
+    def _predacao(self, pred:int, pres:int):
+        self.e.eventos['predacao'] += 1
+        self.P[pred], self.V[pred] = self._colInelastica(pred, pres)
+        self.D[pres] = True
+        # Infecção depois da predação:
+        condSus, condInf = self._checkInf(pred, pres, completa=False)
+        if (condSus and condInf): self._infeccao(pres, pred)
+
+
+    def _reproducao(self, a:int, b:int):
+        self.e.eventos['reproducao'] += 1
+        self._colElastica(a, b)
+        pos, vel = self._colInelastica(a, b)
+        esp = self.E[a]
+        self.P.append(pos)
+        self.V.append(vel)
+        self.R.append(float(self.e.raioEsp[esp]))
+        self.M.append(float(self.e.massaEsp[esp]))
+        self.E.append(esp)
+        self.S.append(True)
+        self.C.append(float(self.e.taxaMort[esp]))
+        self.I.append(0)
+        self.D.append(False)
+        self.L.append(False)
+        self.e.numIndividuos[esp] += 1
+
+
+    def _morte(self, a:int):
+        self.e.eventos['morte'] += 1
+        self.D[a] = True
+
+
+    def _checkInf(self, a:int, b:int, completa=True):
+        esp1, esp2 = self.E[a], self.E[b]
+        saud1, saud2 = self.S[a], self.S[b]
+        infect, sus = None, None
+        condEspInf = (esp1 == esp2)
+        condSus = (saud1 != saud2)
+        condInf = self.rng.random() < self.taxaInf[esp1]
+        if ((not saud1) and (saud2)): infect, sus = a, b
+        elif ((saud1) and (not saud2)): infect, sus = b, a
+        # Incompleta:
+        condSus2 = ((saud1==True) and (saud2==False))
+
+        if completa: return condEspInf, condSus, condInf, infect, sus
+        else: return condInf, condSus2
+
+
+    def _checkPred(self, a:int, b:int):
+        condPred, pred, pres = None, None, None
+        esp1, esp2 = self.E[a], self.E[b]
+        presa = self.presa
+        condEspPred = presa[esp1][esp2] or presa[esp2][esp1]
+        if presa[esp1][esp2]: pred, pres = a, b
+        elif presa[esp2][esp1]: pred, pres = b, a
+        if (pred is not None):
+            condPred = self.rng.random() < self.taxaPred[self.E[pres]]
+            self.I[pred] = 0
+
+        return condEspPred, condPred, pred, pres
+
+
+    def _checkRepr(self, a:int, b:int):
+        esp1, esp2 = self.E[a], self.E[b]
+        condEspRepr = (esp1 == esp2)
+        condRepr = self.rng.random() < self.taxaNat[esp1]
+
+        return condEspRepr, condRepr
+
+
+    def _checkMort(self, a:int):
+        return self.rng.random() < self.C[a]
+
+
+    def _interacao(self, a:int, b:int):
+        self.I[a] += 1
+        self.I[b] += 1
+        # Checando tipo de interação:
+        condEspInf, condSus, condInf, infect, sus = self._checkInf(a, b)
+        condEspPred, condPred, pred, pres = self._checkPred(a, b)
+        condEspRepr, condRepr = self._checkRepr(a, b)
+        condMort1, condMort2 = self._checkMort(a), self._checkMort(b)
+        # Defininindo tipo de interação:
+        if (condEspInf and condSus and condInf): self._infeccao(infect, sus)
+        if (condEspPred and condPred): self._predacao(pred, pres)
+        if (condEspRepr and condRepr): self._reproducao(a, b)
+        if condMort1: self._morte(a)
+        if condMort2: self._morte(b)
+        else: self._colElastica(a, b)
+
+
+    def _atualizaVizinhos(self, a:int):
+        (x, y), r = self.P[a], self.R[a]+self.e.alcance
+        return [b for b, (x2, y2) in enumerate(self.P)
+                if (self._dist(x, y, x2, y2) <= r) and (a != b)]
+
+
+    def _atualizaPos(self, a:int):
+        (x, y), (vx, vy), dt = self.P[a], self.V[a], self.e.dt
+        self.P[a] = [x+vx*dt, y+vy*dt]
+
+
+    def _atualizaInf(self, a:int):
+        self.C[a] += (.001*self.I[a]*self.C[a])
+
+
+    def _atualizaMort(self, a:int):
+        self.C[a] += (.001*self.I[a]*self.C[a])
+
+
+    def _colCheckIndInd(self, a:int, b:int):
+        (x1, y1), (vx1, vy1), r1 = self.P[a], self.V[a], self.R[a]
+        (x2, y2), (vx2, vy2), r2 = self.P[b], self.V[b], self.R[b]
+        dt = self.e.dt
+        distMinima = r1+r2
+        distancia = self._dist(x1, y1, x2, y2)
+        distancia_ = self._dist(x1+vx1*dt, y1+vy1*dt, x2+vx2*dt, y2+vy2*dt)
+        if (distancia <= distMinima) and (distancia > distancia_):
+            self._interacao(a, b)
+
+
+    def _colCheckIndParede(self, a:int):
+        (x, y), (vx, vy), r = self.P[a], self.V[a], self.R[a]
+        dt, limite = self.e.dt, self.e.ladoCaixa/2-r
+        if (abs(x) >= limite) and (abs(x) < abs(x+vx*dt)): vx = -vx
+        if (abs(y) >= limite) and (abs(y) < abs(y+vy*dt)): vy = -vy
+        self.V[a] = [vx, vy]
+
+
+class BackendNumpy(Backend):
+    '''
+    Backend vetorizado com NumPy. Todas as posições são atualizadas de uma vez
+    e os contatos do frame são resolvidos em conjunto, a partir do estado no
+    início da fase de interações; por isso só é equivalente à referência em
+    distribuição, não execução a execução.
+    '''
+    nome = 'numpy'
+
+    def semeia(self, semente:int=None):
+        self.rng = np.random.default_rng(semente)
+
+
+    def colElastica(self, estado:Estado, i:np.ndarray, j:np.ndarray):
+        pos, vel, massa = estado.pos, estado.vel, estado.massa
+        x1, x2, v1, v2 = pos[i], pos[j], vel[i], vel[j]
+        m1, m2 = massa[i], massa[j]
+        d1, d2 = x1-x2, x2-x1
+        k1 = ((2*m2)/(m1+m2))*(_dot(v1-v2, d1)/_dot(d1, d1))
+        k2 = ((2*m1)/(m1+m2))*(_dot(v2-v1, d2)/_dot(d2, d2))
+        vel[i] = v1 - k1[:, None]*d1
+        vel[j] = v2 - k2[:, None]*d2
+
+
+    def vizinhos(self, estado:Estado):
+        n = estado.n
+        pos = estado.pos[:n]
+        d = pos[:, None, :] - pos[None, :, :]
+        dist = np.sqrt(d[..., 0]*d[..., 0] + d[..., 1]*d[..., 1])
+        proximos = dist <= (estado.raio[:n]+estado.alcance)[:, None]
+        np.fill_diagonal(proximos, False)
+        return np.nonzero(proximos)
+
+
+    def contatos(self, estado:Estado, pares:tuple=None):
+        '''
+        Lista os pares i < j em contato e se aproximando, como em
+        `colCheckIndInd`.
+
+        Args:
+            estado (Estado): estado da simulação
+            pares (tuple, optional): resultado de `vizinhos`, se já calculado
+
+        Returns:
+            (np.ndarray, np.ndarray): índices i e j de cada par
+        '''
+        i, j = pares if (pares is not None) else self.vizinhos(estado)
+        i, j = i[i < j], j[i < j]
+        pos, vel, dt = estado.pos, estado.vel, estado.dt
+        d = pos[i] - pos[j]
+        d_ = d + (vel[i] - vel[j])*dt
+        distancia, distancia_ = np.sqrt(_dot(d, d)), np.sqrt(_dot(d_, d_))
+        cond = ((distancia <= estado.raio[i]+estado.raio[j]) &
+                (distancia > distancia_))
+        return i[cond], j[cond]
+
+
+    def interacoes(self, estado:Estado, i:np.ndarray, j:np.ndarray):
+        '''
+        Resolve, de uma vez, as interações de todos os pares em contato na
+        mesma ordem de `main.interacao`: infecção, predação (com a infecção
+        que a segue), reprodução e mortalidade.
+
+        Args:
+            estado (Estado): estado da simulação
+            i (np.ndarray): índices de um dos indivíduos de cada par
+            j (np.ndarray): índices do outro indivíduo de cada par
+        '''
+        e = estado
+        if (len(i) == 0): return
+        np.add.at(e.intCount, i, 1)
+        np.add.at(e.intCount, j, 1)
+        sorteio = self.rng.random((6, len(i)))
+        esp1, esp2 = e.especie[i], e.especie[j]
+        mesmaEsp = (esp1 == esp2)
+        # Checando tipo de interação:
+        saud1 = e.saudavel[i]
+        condInf = (mesmaEsp & (saud1 != e.saudavel[j]) &
+                   (sorteio[0] < e.taxaInf[esp1]))
+        infect, sus = np.where(saud1, j, i), np.where(saud1, i, j)
+        predIJ, predJI = e.presa[esp1, esp2], e.presa[esp2, esp1]
+        temPred = predIJ | predJI
+        pred, pres = np.where(predIJ, i, j), np.where(predIJ, j, i)
+        e.intCount[pred[temPred]] = 0
+        condPred = temPred & (sorteio[1] < e.taxaPred[e.especie[pres]])
+        condRepr = mesmaEsp & (sorteio[2] < e.taxaNat[esp1])
+        condMort1 = sorteio[3] < e.chanceMort[i]
+        condMort2 = sorteio[4] < e.chanceMort[j]
+        # Infecção:
+        self._infeccao(e, infect[condInf], sus[condInf])
+        # Predação, seguida de infecção do predador:
+        pred, pres = pred[condPred], pres[condPred]
+        e.eventos['predacao'] += len(pred)
+        e.pos[pred], e.vel[pred] = _colInelastica(e, pred, pres)
+        e.morto[pres] = True
+        condInf2 = ((sorteio[5][condPred] < e.taxaInf[e.especie[pred]]) &
+                    e.saudavel[pred] & ~e.saudavel[pres])
+        self._infeccao(e, pres[condInf2], pred[condInf2])
+        # Reprodução:
+        a, b = i[condRepr], j[condRepr]
+        e.eventos['reproducao'] += len(a)
+        self.colElastica(e, a, b)
+        pos, vel = _colInelastica(e, a, b)
+        for k in range(len(a)):
+            e.criaIndividuo(pos[k], vel[k], e.especie[a[k]])
+        # Mortalidade:
+        e.eventos['morte'] += int(condMort1.sum() + condMort2.sum())
+        e.morto[i[condMort1]] = True
+        e.morto[j[condMort2]] = True
+        self.colElastica(e, i[~condMort2], j[~condMort2])
+
+
+    def _infeccao(self, e:Estado, infect:np.ndarray, sus:np.ndarray):
+        self.colElastica(e, infect, sus)
+        novos = np.unique(sus[e.saudavel[sus]])
+        e.saudavel[novos] = False
+        e.listaInf[novos] = True
+        e.numInfectados += np.bincount(e.especie[novos],
+                                       minlength=len(ESPECIES))
+        e.eventos['infeccao'] += len(novos)
+
+
+    def passo(self, estado:Estado):
+        e = estado
+        t0 = perf_counter()
+        n = e.n
+        e.pos[:n] += e.vel[:n]*e.dt
+        e.chanceMort[:n] += .001*e.intCount[:n]*e.chanceMort[:n]
+        t1 = perf_counter()
+        pares = self.vizinhos(e)
+        t2 = perf_counter()
+        self.interacoes(e, *self.contatos(e, pares))
+        t3 = perf_counter()
+        # Paredes:
+        n = e.n
+        pos, vel = e.pos[:n], e.vel[:n]
+        limite = (e.ladoCaixa/2 - e.raio[:n])[:, None]
+        batida = ((np.abs(pos) >= limite) &
+                  (np.abs(pos) < np.abs(pos+vel*e.dt)))
+        vel[batida] = -vel[batida]
+        t4 = perf_counter()
+        # Mortalidade dos infectados:
+        inf = e.listaInf[:n]
+        e.chanceMort[:n][inf] += .001*e.intCount[:n][inf]*e.chanceMort[:n][inf]
+        t5 = perf_counter()
+        tempos = self.tempos
+        tempos['movimento'] += t1-t0
+        tempos['vizinhos'] += t2-t1
+        tempos['interacoes'] += t3-t2
+        tempos['paredes'] += t4-t3
+        tempos['infectados'] += t5-t4
+
+
+class BackendJit(Backend):
+    '''
+    Backend com os laços de `main.step` compilados pelo numba (veja
+    `kernels`). Segue a mesma ordem sequencial da referência, mas com o
+    gerador do numba, que é global ao processo: duas instâncias compartilham
+    o mesmo gerador.
+    '''
+    nome = 'jit'
+    # O frame inteiro roda em um único kernel compilado:
+    FASES = ('kernel',)
+
+    def __init__(self, semente:int=None):
+        if not kernels.disponivel:
+            raise ImportError('O backend jit requer o numba.')
+        super().__init__(semente)
+
+
+    def semeia(self, semente:int=None):
+        if (semente is None):
+            semente = int(np.random.SeedSequence().generate_state(1)[0])
+        kernels.semeia(semente)
+
+
+    def colElastica(self, estado:Estado, i:np.ndarray, j:np.ndarray):
+        kernels.colElasticaPares(estado.pos, estado.vel, estado.massa,
+                                 np.asarray(i, dtype=np.int64),
+                                 np.asarray(j, dtype=np.int64))
+
+
+    def vizinhos(self, estado:Estado):
+        return kernels.paresVizinhos(estado.pos, estado.raio, estado.n,
+                                     estado.alcance)
+
+
+    def passo(self, estado:Estado):
+        t0 = perf_counter()
+        e = estado
+        # Folga para os nascimentos do frame; se faltar, os arrays crescem e
+        # o kernel retoma do ponto em que parou:
+        e.reserva(2*e.n + 64)
+        eventos = np.zeros(len(EVENTOS), dtype=np.int64)
+        vizinhos = np.empty(len(e.raio), dtype=np.int64)
+        retomada = np.array([0, -1, 0], dtype=np.int64)
+        tabela = kernels.tabelaEspecies(e)
+        while True:
+            e.n, concluido = kernels.passo(
+                e.n, e.pos, e.vel, e.raio, e.massa, e.especie, e.saudavel,
+                e.chanceMort, e.intCount, e.morto, e.listaInf, tabela,
+                e.presa, e.numIndividuos, e.numInfectados, eventos, e.dt,
+                e.ladoCaixa, e.alcance, vizinhos, retomada)
+            if concluido: break
+            e.reserva(2*len(e.raio))
+            vizinhos = np.concatenate([vizinhos, np.empty(len(e.raio) -
+                                       len(vizinhos), dtype=np.int64)])
+        for k, evento in enumerate(EVENTOS):
+            e.eventos[evento] += int(eventos[k])
+        self.tempos['kernel'] += perf_counter()-t0
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Funções                                   #
+# ---------------------------------------------------------------------------- #
+
+def _dot(a:np.ndarray, b:np.ndarray):
+    return a[:, 0]*b[:, 0] + a[:, 1]*b[:, 1]
+
+
+def _colInelastica(e:Estado, a:np.ndarray, b:np.ndarray):
+    m1, m2 = e.massa[a][:, None], e.massa[b][:, None]
+    m_ = (m1+m2)/2
+    return (e.pos[a]+e.pos[b])/2, (m1*e.vel[a]+m2*e.vel[b])/m_
+
+
+def populacaoInicial(semente:int=None, propriedades:dict=None):
+    '''
+    Cria o estado inicial como `main.criaPopulacao`, espécie por espécie, com
+    um gerador `random.Random` próprio. A mesma semente gera a mesma população
+    para qualquer backend.
+
+    Args:
+        semente (int, optional): semente do gerador
+        propriedades (dict, optional): propriedades das espécies. Por padrão,
+    as de `parametros`
+
+    Returns:
+        (Estado): estado inicial da simulação
+    '''
+    rng = Random(semente)
+    estado = Estado(propriedades)
+    lado, velLimite = int(parametros.ladoCaixa), parametros.velLimite
+    for k, especie in enumerate(ESPECIES):
+        dic = estado.propriedades[especie]
+        for _ in range(dic['numIndividuosInicial']):
+            pos = [rng.randrange(-lado//2+1, lado//2-1) for _ in range (2)]
+            vel = [(rng.random() * velLimite) for _ in range(2)]
+            saudavel = rng.random() > dic['taxaInf']
+            estado.criaIndividuo(pos, vel, k, saudavel)
+    return estado
+
+
+def selecionaBackend(nome:str=None, semente:int=None):
+    '''
+    Instancia um backend pelo nome. Sem nome, usa a variável de ambiente
+    BIOMATEMATICA_BACKEND ou, na falta dela, o backend de referência. Se o
+    backend jit for pedido sem o numba instalado, usa o backend numpy.
+
+    Args:
+        nome (str, optional): um dos nomes em BACKENDS
+        semente (int, optional): semente do gerador do backend
+
+    Returns:
+        (Backend): backend escolhido
+    '''
+    nome = nome or os.environ.get('BIOMATEMATICA_BACKEND', 'referencia')
+    if (nome not in BACKENDS):
+        raise ValueError(f'Backend desconhecido: {nome!r}; opções: '
+                         f'{", ".join(BACKENDS)}')
+    if (nome == 'jit') and (not kernels.disponivel):
+        warnings.warn('numba não encontrado; usando o backend numpy.')
+        nome = 'numpy'
+    return BACKENDS[nome](semente)
+
+
+BACKENDS = {backend.nome: backend for backend in (BackendReferencia,
+                                                  BackendNumpy, BackendJit)}
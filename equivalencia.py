@@ -0,0 +1,210 @@
+# ---------------------------------------------------------------------------- #
+#                                  Importações                                 #
+# ---------------------------------------------------------------------------- #
+
+import argparse
+import sys
+from copy import deepcopy
+from math import erfc, exp, sqrt
+import numpy as np
+from backends import ESPECIES, EVENTOS, Backend, populacaoInicial, \
+selecionaBackend, BACKENDS
+from simulador import simula
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Funções                                   #
+# ---------------------------------------------------------------------------- #
+
+# ------------------------------- Estatística -------------------------------- #
+
+def testeKS(a:np.ndarray, b:np.ndarray):
+    '''
+    Teste de Kolmogorov-Smirnov para duas amostras, com o p-valor pela
+    distribuição assintótica.
+
+    Args:
+        a (np.ndarray): primeira amostra
+        b (np.ndarray): segunda amostra
+
+    Returns:
+        (float, float): estatística D e p-valor
+    '''
+    a, b = np.sort(a), np.sort(b)
+    valores = np.concatenate([a, b])
+    fa = np.searchsorted(a, valores, side='right')/len(a)
+    fb = np.searchsorted(b, valores, side='right')/len(b)
+    d = float(np.abs(fa-fb).max())
+    if (d == 0): return d, 1.
+    en = sqrt(len(a)*len(b)/(len(a)+len(b)))
+    lambd = (en + .12 + .11/en)*d
+    p = 2*sum((-1)**(k-1)*exp(-2*(k*lambd)**2) for k in range(1, 101))
+    return d, min(max(p, 0.), 1.)
+
+
+def testeMedias(a:np.ndarray, b:np.ndarray):
+    '''
+    Teste de Welch para a diferença entre médias, com o p-valor pela
+    aproximação normal.
+
+    Args:
+        a (np.ndarray): primeira amostra
+        b (np.ndarray): segunda amostra
+
+    Returns:
+        (float, float): estatística t e p-valor
+    '''
+    erro = sqrt(np.var(a, ddof=1)/len(a) + np.var(b, ddof=1)/len(b))
+    dif = float(np.mean(a) - np.mean(b))
+    if (erro == 0): return 0., float(dif == 0)
+    t = dif/erro
+    return t, erfc(abs(t)/sqrt(2))
+
+
+# -------------------------------- Comparação -------------------------------- #
+
+def comparaDeterministicos(referencia:Backend, candidato:Backend,
+                           semente:int=0):
+    '''
+    Compara os kernels determinísticos dos dois backends, que devem concordar
+    exatamente. As posições da população inicial recebem um ruído contínuo
+    para que não haja indivíduos sobrepostos, e as colisões são aplicadas a
+    pares disjuntos.
+
+    Args:
+        referencia (Backend): backend de referência
+        candidato (Backend): backend a ser verificado
+        semente (int, optional): semente da população. 0 por padrão
+
+    Returns:
+        (dict): verdadeiro ou falso para cada kernel
+    '''
+    rng = np.random.default_rng(semente)
+    estado = populacaoInicial(semente)
+    n = estado.n
+    estado.pos[:n] += rng.uniform(-.5, .5, (n, 2))
+    ordem = rng.permutation(n)[:n//2*2]
+    i, j = ordem[0::2], ordem[1::2]
+    resultado = {}
+
+    estados = deepcopy(estado), deepcopy(estado)
+    referencia.colElastica(estados[0], i, j)
+    candidato.colElastica(estados[1], i, j)
+    resultado['colElastica'] = np.array_equal(estados[0].vel[:n],
+                                              estados[1].vel[:n])
+
+    pares = referencia.vizinhos(estado), candidato.vizinhos(estado)
+    resultado['vizinhos'] = all(np.array_equal(x, y)
+                                for x, y in zip(*pares))
+    return resultado
+
+
+def comparaEstocasticos(referencia:Backend, candidato:Backend,
+                        nExecucoes:int=20, passos:int=4000, semente:int=0,
+                        nPontos:int=10, alfa:float=.01):
+    '''
+    Compara as distribuições produzidas pelos dois backends com sementes e
+    parâmetros pareados: populações em `nPontos` frames (KS), taxas de cada
+    evento (Welch), número de execuções em que cada espécie se extinguiu
+    (Welch sobre a proporção) e tempos de extinção (KS, com as execuções que
+    não se extinguiram contadas em passos+1). O nível `alfa` é corrigido por
+    Bonferroni para o número de testes feitos.
+
+    Se uma espécie não se extinguiu em nenhuma execução de nenhum dos
+    backends, os testes de extinção dela são ignorados (com 'p' None e uma
+    'nota'), pois não teriam como detectar diferença. Com os parâmetros
+    atuais, as presas só começam a se extinguir por volta do frame 3000.
+
+    Args:
+        referencia (Backend): backend de referência
+        candidato (Backend): backend a ser verificado
+        nExecucoes (int, optional): execuções por backend. 20 por padrão
+        passos (int, optional): frames por execução. 4000 por padrão
+        semente (int, optional): semente da primeira execução; a k-ésima usa
+    semente+k. 0 por padrão
+        nPontos (int, optional): frames comparados nas trajetórias. 10 por
+    padrão
+        alfa (float, optional): nível de significância global. 0.01 por padrão
+
+    Returns:
+        (list): um dicionário por teste, com 'grandeza', 'estatistica', 'p',
+    'ok' e, nos testes ignorados, 'nota'
+    '''
+    resultados = [[simula(backend, passos, semente+k)
+                   for k in range(nExecucoes)]
+                  for backend in (referencia, candidato)]
+    conc = [np.stack([r['conc'] for r in res]) for res in resultados]
+    extincao = [np.stack([r['extincao'] for r in res]) for res in resultados]
+    extinta = [~np.isnan(ext) for ext in extincao]
+    extincao = [np.nan_to_num(ext, nan=passos+1) for ext in extincao]
+    taxas = [{evento: np.array([r['eventos'][evento]/passos for r in res])
+              for evento in EVENTOS} for res in resultados]
+
+    testes, ignorados = [], []
+    frames = np.linspace(0, passos, nPontos+1).astype(int)[1:]
+    for k, especie in enumerate(ESPECIES):
+        for t in frames:
+            testes.append((f'população {especie} (frame {t})',
+                           testeKS(conc[0][:, t, k], conc[1][:, t, k])))
+        extintas = [int(ext[:, k].sum()) for ext in extinta]
+        if (sum(extintas) == 0):
+            ignorados.append({'grandeza': f'extinção {especie}',
+                              'estatistica': None, 'p': None, 'ok': True,
+                              'nota': f'nenhuma execução se extinguiu em '
+                                      f'{passos} frames; teste ignorado'})
+            continue
+        testes.append((f'execuções extintas {especie} ({extintas[0]}/'
+                       f'{nExecucoes} contra {extintas[1]}/{nExecucoes})',
+                       testeMedias(extinta[0][:, k], extinta[1][:, k])))
+        testes.append((f'tempo de extinção {especie}',
+                       testeKS(extincao[0][:, k], extincao[1][:, k])))
+    for evento in EVENTOS:
+        testes.append((f'taxa de {evento}',
+                       testeMedias(taxas[0][evento], taxas[1][evento])))
+
+    limite = alfa/len(testes)
+    return [{'grandeza': grandeza, 'estatistica': estat, 'p': p,
+             'ok': p >= limite}
+            for grandeza, (estat, p) in testes] + ignorados
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Simulação                                  #
+# ---------------------------------------------------------------------------- #
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compara um backend com o backend de referência.')
+    parser.add_argument('candidato', choices=list(BACKENDS))
+    parser.add_argument('--referencia', choices=list(BACKENDS),
+                        default='referencia')
+    parser.add_argument('--execucoes', type=int, default=20)
+    parser.add_argument('--passos', type=int, default=4000,
+                        help='frames por execução; a extinção das presas só '
+                             'começa por volta do frame 3000')
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--alfa', type=float, default=.01)
+    args = parser.parse_args()
+
+    referencia = selecionaBackend(args.referencia)
+    candidato = selecionaBackend(args.candidato)
+    ok = True
+    print(f'\n--------- Kernels determinísticos ({candidato.nome}):')
+    for kernel, igual in comparaDeterministicos(referencia, candidato,
+                                                args.semente).items():
+        print(f'          {kernel}: {"ok" if igual else "DIFERENTE"}')
+        ok = ok and igual
+    print(f'\n--------- Distribuições ({args.execucoes} execuções de '
+          f'{args.passos} frames):')
+    for teste in comparaEstocasticos(referencia, candidato, args.execucoes,
+                                     args.passos, args.semente,
+                                     alfa=args.alfa):
+        if (teste['p'] is None):
+            print(f'          {teste["grandeza"]}: {teste["nota"]}')
+            continue
+        print(f'          {teste["grandeza"]}: '
+              f'estatística={teste["estatistica"]:.3f} p={teste["p"]:.3g}'
+              f'{"" if teste["ok"] else "  <- DIFERENTE"}')
+        ok = ok and teste['ok']
+    print('\n--------- Equivalentes!' if ok else '\n--------- Diferentes!')
+    sys.exit(0 if ok else 1)
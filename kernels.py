@@ -0,0 +1,263 @@
+# ---------------------------------------------------------------------------- #
+#                                  Importações                                 #
+# ---------------------------------------------------------------------------- #
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Constantes                                 #
+# ---------------------------------------------------------------------------- #
+
+# Verdadeiro se o numba está instalado e os kernels são compilados:
+disponivel = njit is not None
+
+# Linhas da tabela de espécies (veja `tabelaEspecies`):
+RAIO, MASSA, TAXA_NAT, TAXA_MORT, TAXA_INF, TAXA_PRED = range(6)
+
+# Posições no array de eventos:
+INFECCAO, PREDACAO, REPRODUCAO, MORTE = range(4)
+
+# Posições no array de retomada de `passo`:
+RETOMA_A, RETOMA_K, RETOMA_NV = range(3)
+
+
+def _compila(funcao):
+    '''
+    Compila a função com o numba, guardando o código de máquina em disco
+    (`__pycache__` ou NUMBA_CACHE_DIR) para que novas execuções não precisem
+    recompilar. Sem numba, devolve a função em Python.
+    '''
+    if not disponivel: return funcao
+    return njit(cache=True, nogil=True)(funcao)
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Funções                                   #
+# ---------------------------------------------------------------------------- #
+
+def tabelaEspecies(estado):
+    '''
+    Junta as propriedades por espécie do estado em uma tabela (6, espécies),
+    indexada pelas constantes RAIO, MASSA, TAXA_NAT, TAXA_MORT, TAXA_INF e
+    TAXA_PRED.
+
+    Args:
+        estado (backends.Estado): estado da simulação
+
+    Returns:
+        (np.ndarray): tabela de propriedades
+    '''
+    return np.stack([estado.raioEsp, estado.massaEsp, estado.taxaNat,
+                     estado.taxaMort, estado.taxaInf, estado.taxaPred])
+
+
+# -------------------------------- Aleatório --------------------------------- #
+
+@_compila
+def semeia(semente):
+    '''
+    Semeia o gerador de números aleatórios usado dentro dos kernels (o do
+    numba é separado do `np.random` do Python).
+    '''
+    np.random.seed(semente)
+
+
+# --------------------------------- Dinâmica --------------------------------- #
+
+@_compila
+def colElastica(pos, vel, massa, a, b):
+    x1, y1, x2, y2 = pos[a, 0], pos[a, 1], pos[b, 0], pos[b, 1]
+    vx1, vy1, vx2, vy2 = vel[a, 0], vel[a, 1], vel[b, 0], vel[b, 1]
+    m1, m2 = massa[a], massa[b]
+    dx1, dy1, dx2, dy2 = x1-x2, y1-y2, x2-x1, y2-y1
+    k1 = ((2*m2)/(m1+m2))*(((vx1-vx2)*dx1 + (vy1-vy2)*dy1)
+                           /(dx1*dx1 + dy1*dy1))
+    k2 = ((2*m1)/(m1+m2))*(((vx2-vx1)*dx2 + (vy2-vy1)*dy2)
+                           /(dx2*dx2 + dy2*dy2))
+    vel[a, 0], vel[a, 1] = vx1 - k1*dx1, vy1 - k1*dy1
+    vel[b, 0], vel[b, 1] = vx2 - k2*dx2, vy2 - k2*dy2
+
+
+@_compila
+def colElasticaPares(pos, vel, massa, i, j):
+    for k in range(len(i)):
+        colElastica(pos, vel, massa, i[k], j[k])
+
+
+@_compila
+def colInelastica(pos, vel, massa, a, b):
+    m1, m2 = massa[a], massa[b]
+    m_ = (m1+m2)/2
+    return ((pos[a, 0]+pos[b, 0])/2, (pos[a, 1]+pos[b, 1])/2,
+            (m1*vel[a, 0]+m2*vel[b, 0])/m_, (m1*vel[a, 1]+m2*vel[b, 1])/m_)
+
+
+@_compila
+def dist(x1, y1, x2, y2):
+    dx, dy = x1-x2, y1-y2
+    return np.sqrt(dx*dx + dy*dy)
+
+
+@_compila
+def atualizaVizinhos(pos, raio, n, alcance, a, vizinhos):
+    '''
+    Grava em `vizinhos` os índices próximos ao indivíduo a e devolve quantos
+    são.
+    '''
+    r = raio[a]+alcance
+    nv = 0
+    for b in range(n):
+        if (dist(pos[a, 0], pos[a, 1], pos[b, 0], pos[b, 1]) <= r) and \
+        (a != b):
+            vizinhos[nv] = b
+            nv += 1
+    return nv
+
+
+@_compila
+def paresVizinhos(pos, raio, n, alcance):
+    vizinhos = np.empty(n, dtype=np.int64)
+    contagem = np.empty(n, dtype=np.int64)
+    for a in range(n):
+        contagem[a] = atualizaVizinhos(pos, raio, n, alcance, a, vizinhos)
+    i = np.empty(contagem.sum(), dtype=np.int64)
+    j = np.empty(contagem.sum(), dtype=np.int64)
+    k = 0
+    for a in range(n):
+        nv = atualizaVizinhos(pos, raio, n, alcance, a, vizinhos)
+        i[k:k+nv] = a
+        j[k:k+nv] = vizinhos[:nv]
+        k += nv
+    return i, j
+
+
+@_compila
+def infeccao(infect, sus, pos, vel, massa, especie, saudavel, listaInf,
+             numInfectados, eventos):
+    colElastica(pos, vel, massa, infect, sus)
+    saudavel[sus] = False
+    numInfectados[especie[sus]] += 1
+    listaInf[sus] = True
+    eventos[INFECCAO] += 1
+
+
+@_compila
+def interacao(a, b, n, pos, vel, raio, massa, especie, saudavel, chanceMort,
+              intCount, morto, listaInf, tabela, presa, numIndividuos,
+              numInfectados, eventos):
+    '''
+    Resolve um contato como `main.interacao`, com os sorteios na mesma ordem.
+    Devolve o novo número de indivíduos.
+    '''
+    intCount[a] += 1
+    intCount[b] += 1
+    esp1, esp2 = especie[a], especie[b]
+    saud1, saud2 = saudavel[a], saudavel[b]
+    # Checando tipo de interação:
+    condInf = np.random.random() < tabela[TAXA_INF, esp1]
+    condInf = condInf and (esp1 == esp2) and (saud1 != saud2)
+    infect, sus = (a, b) if saud2 else (b, a)
+    pred, pres = -1, -1
+    if presa[esp1, esp2]: pred, pres = a, b
+    elif presa[esp2, esp1]: pred, pres = b, a
+    condPred = False
+    if (pred >= 0):
+        condPred = np.random.random() < tabela[TAXA_PRED, especie[pres]]
+        intCount[pred] = 0
+    condRepr = np.random.random() < tabela[TAXA_NAT, esp1]
+    condRepr = condRepr and (esp1 == esp2)
+    condMort1 = np.random.random() < chanceMort[a]
+    condMort2 = np.random.random() < chanceMort[b]
+    # Defininindo tipo de interação:
+    if condInf:
+        infeccao(infect, sus, pos, vel, massa, especie, saudavel, listaInf,
+                 numInfectados, eventos)
+    if condPred:
+        eventos[PREDACAO] += 1
+        x, y, vx, vy = colInelastica(pos, vel, massa, pred, pres)
+        pos[pred, 0], pos[pred, 1], vel[pred, 0], vel[pred, 1] = x, y, vx, vy
+        morto[pres] = True
+        # Infecção depois da predação:
+        condInf = np.random.random() < tabela[TAXA_INF, especie[pred]]
+        if (condInf and saudavel[pred] and not saudavel[pres]):
+            infeccao(pres, pred, pos, vel, massa, especie, saudavel, listaInf,
+                     numInfectados, eventos)
+    if condRepr:
+        eventos[REPRODUCAO] += 1
+        colElastica(pos, vel, massa, a, b)
+        x, y, vx, vy = colInelastica(pos, vel, massa, a, b)
+        # `passo` garante que há espaço para o novo indivíduo:
+        pos[n, 0], pos[n, 1], vel[n, 0], vel[n, 1] = x, y, vx, vy
+        raio[n], massa[n] = tabela[RAIO, esp1], tabela[MASSA, esp1]
+        especie[n], saudavel[n] = esp1, True
+        chanceMort[n], intCount[n] = tabela[TAXA_MORT, esp1], 0
+        morto[n], listaInf[n] = False, False
+        numIndividuos[esp1] += 1
+        n += 1
+    if condMort1:
+        eventos[MORTE] += 1
+        morto[a] = True
+    if condMort2:
+        eventos[MORTE] += 1
+        morto[b] = True
+    else: colElastica(pos, vel, massa, a, b)
+    return n
+
+
+@_compila
+def passo(n, pos, vel, raio, massa, especie, saudavel, chanceMort, intCount,
+          morto, listaInf, tabela, presa, numIndividuos, numInfectados,
+          eventos, dt, ladoCaixa, alcance, vizinhos, retomada):
+    '''
+    Laço de `main.step` indivíduo por indivíduo: posição, vizinhos,
+    mortalidade, colisões entre indivíduos e com as paredes, e por fim a
+    mortalidade dos infectados.
+
+    Antes de cada interação, se não houver espaço nos arrays para um
+    possível nascimento, o kernel para sem sortear nada e grava em `retomada`
+    o indivíduo, o vizinho e o número de vizinhos atuais; chamado de novo com
+    arrays maiores (e os mesmos `vizinhos` e `retomada`), continua do mesmo
+    ponto. Na primeira chamada, `retomada` deve ser [0, -1, 0].
+
+    Devolve o novo número de indivíduos e se o frame foi concluído.
+    '''
+    a, k0, nv = retomada[RETOMA_A], retomada[RETOMA_K], retomada[RETOMA_NV]
+    # Indivíduos nascidos no frame também são percorridos, como em main:
+    while (a < n):
+        if (k0 < 0):
+            pos[a, 0] += vel[a, 0]*dt
+            pos[a, 1] += vel[a, 1]*dt
+            nv = atualizaVizinhos(pos, raio, n, alcance, a, vizinhos)
+            chanceMort[a] += (.001*intCount[a]*chanceMort[a])
+            k0 = 0
+        for k in range(k0, nv):
+            b = vizinhos[k]
+            x1, y1, x2, y2 = pos[a, 0], pos[a, 1], pos[b, 0], pos[b, 1]
+            vx1, vy1, vx2, vy2 = vel[a, 0], vel[a, 1], vel[b, 0], vel[b, 1]
+            distancia = dist(x1, y1, x2, y2)
+            distancia_ = dist(x1+vx1*dt, y1+vy1*dt, x2+vx2*dt, y2+vy2*dt)
+            if (distancia <= raio[a]+raio[b]) and (distancia > distancia_):
+                if (n == len(raio)):
+                    retomada[RETOMA_A], retomada[RETOMA_K] = a, k
+                    retomada[RETOMA_NV] = nv
+                    return n, False
+                n = interacao(a, b, n, pos, vel, raio, massa, especie,
+                              saudavel, chanceMort, intCount, morto, listaInf,
+                              tabela, presa, numIndividuos, numInfectados,
+                              eventos)
+        k0 = -1
+        limite = ladoCaixa/2-raio[a]
+        for eixo in range(2):
+            x, v = pos[a, eixo], vel[a, eixo]
+            if (abs(x) >= limite) and (abs(x) < abs(x+v*dt)):
+                vel[a, eixo] = -v
+        a += 1
+    for a in range(n):
+        if listaInf[a]: chanceMort[a] += (.001*intCount[a]*chanceMort[a])
+    return n, True
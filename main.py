@@ -6,6 +6,8 @@ from vpython import *
 from vpython.no_notebook import stop_server
 from random import random, randrange
 from numpy import savetxt
+from copy import deepcopy
+import parametros
 
 
 # ---------------------------------------------------------------------------- #
@@ -191,7 +193,7 @@ def checkPred(i1:Individuo, i2:Individuo):
     condPred, pred, pres = None, None, None
     esp1, esp2 = i1.especie, i2.especie
     esps = [esp1, esp2]
-    combos = [('Gato', 'Rato'), ('Gato', 'Coelho'), ('Leao', 'Gato')]
+    combos = parametros.combosPred
     condEspPred = any(all(bicho in esps for bicho in combo)for combo in combos)
     for pred_, pres_ in combos:
         if ((esp1 == pred_) and (esp2 == pres_)): pred, pres = i1, i2
@@ -270,10 +272,10 @@ def atualizaVizinhos(i:Individuo):
     global indVivos
     
     i.vizinhos.clear()
-    x, r = i.pos, i.radius
+    x, r = i.pos, i.radius+parametros.alcanceVizinhos
     for i2 in indVivos:
         x2 = i2.pos
-        if (dist(x, x2) <= r+2.5) and (i != i2): i.vizinhos.append(i2)
+        if (dist(x, x2) <= r) and (i != i2): i.vizinhos.append(i2)
 
 
 def atualizaPos(i:Individuo):
@@ -604,69 +606,13 @@ def simulacao():
 # ---------------------------------------------------------------------------- #
 
 # Propriedades dos indivíduos:
-propriedades = {
-    'Rato' : {
-        'raio':.15,
-        'massa':1,
-        'especie':'Rato',
-        'cor':vector(.5,.5,.5),
-        'corInf':vector(0,1,0),
-        'taxaNat':.09,
-        'taxaMort':.005,
-        'taxaInf':.15,
-        'taxaPred':.06,
-        'numIndividuosInicial':50,
-        'numIndividuos':0,
-        'numInfectados':0
-    },
-
-    'Coelho' : {
-        'raio':.2,
-        'massa':2,
-        'especie':'Coelho',
-        'cor':vector(1,1,1),
-        'taxaNat':.07,
-        'taxaMort':.001,
-        'taxaInf':0,
-        'taxaPred':.05,
-        'numIndividuosInicial':40,
-        'numIndividuos':0,
-        'numInfectados':0
-    },
-
-    'Gato' : {
-        'raio':.25,
-        'massa':3,
-        'especie':'Gato',
-        'cor':vector(1,.5,0),
-        'corInf':vector(.2,1,.2),
-        'taxaNat':.06,
-        'taxaMort':.0008,
-        'taxaInf':.1,
-        'taxaPred':.02,
-        'numIndividuosInicial':35,
-        'numIndividuos':0,
-        'numInfectados':0
-    },
-
-    'Leao' : {
-        'raio':.3,
-        'massa':4,
-        'especie':'Leao',
-        'cor':vector(1,1,0),
-        'corInf':vector(.4,1,.4),
-        'taxaNat':.005,
-        'taxaMort':.0009,
-        'taxaInf':.5,
-        'taxaPred':0,
-        'numIndividuosInicial':10,
-        'numIndividuos':0,
-        'numInfectados':0
-    }
-}
-
-dt = 1e-3 # Variação no tempo em cada frame
-velLimite = 20 # Limite de velocidade inicial para as partículas
+propriedades = deepcopy(parametros.propriedades)
+for dic in propriedades.values():
+    dic['cor'] = vector(*dic['cor'])
+    if ('corInf' in dic): dic['corInf'] = vector(*dic['corInf'])
+
+dt = parametros.dt # Variação no tempo em cada frame
+velLimite = parametros.velLimite # Limite de velocidade inicial das partículas
 
 nRato = propriedades['Rato']['numIndividuosInicial'] # Número de ratos
 nCoelho = propriedades['Coelho']['numIndividuosInicial'] # Número de coelhos
@@ -681,7 +627,7 @@ indVivos = [] # Lista de indivíduos vivos
 indInfectados = [] # Lista de indivíduos infectados
 indMortos = [] # Lista de indivíduos mortos
 
-ladoCaixa = 20 # Lado da caixa imaginária contendo a simulação
+ladoCaixa = parametros.ladoCaixa # Lado da caixa imaginária da simulação
 
 # Gráfico de concentração:
 graficosConc = []
@@ -0,0 +1,179 @@
+# ---------------------------------------------------------------------------- #
+#                                  Importações                                 #
+# ---------------------------------------------------------------------------- #
+
+import asyncio
+import json
+import sys
+import threading
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+
+class Monitor:
+    '''
+    Servidor HTTP local, em asyncio e numa thread própria, que acompanha uma
+    simulação sem interface gráfica.
+
+    O laço da simulação só troca a referência de `instantaneo` (`publica`) e lê
+    os atributos `parar` e `checkpoint`; nenhum dos lados usa trava, e o
+    servidor nunca toca no estado da simulação.
+
+    Rotas:
+        GET /metricas: último instantâneo publicado, mais o uso de memória
+        POST /parar: pede o fim da simulação (como o botão "Parar simulação")
+        POST /checkpoint: pede a gravação dos dados parciais
+    '''
+    def __init__(self, host:str='127.0.0.1', porta:int=8765,
+                 intervalo:int=100, aoCheckpoint=None):
+        if (intervalo <= 0):
+            raise ValueError(f'intervalo deve ser positivo, não {intervalo}')
+        self.host = host
+        self.porta = porta
+        self.intervalo = intervalo
+        self.aoCheckpoint = aoCheckpoint
+        self.instantaneo = {}
+        self.parar = False
+        self.checkpoint = False
+        self._loop = None
+        self._thread = None
+        self._erro = None
+
+
+    def publica(self, instantaneo:dict):
+        '''
+        Publica um novo instantâneo. Chamado pelo laço da simulação a cada
+        `intervalo` frames; custa apenas a troca de uma referência.
+
+        Args:
+            instantaneo (dict): métricas da simulação, serializáveis em JSON
+        '''
+        self.instantaneo = instantaneo
+
+
+    def inicia(self):
+        '''
+        Inicia o servidor em uma thread daemon e espera que ele aceite
+        conexões. Com porta 0, `porta` passa a ser a porta escolhida pelo
+        sistema. Se o servidor não puder ser criado (porta ocupada, por
+        exemplo), o erro é relançado aqui.
+        '''
+        pronto = threading.Event()
+        self._erro = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._executa, args=(pronto,),
+                                        daemon=True)
+        self._thread.start()
+        pronto.wait()
+        if (self._erro is not None):
+            self._thread.join()
+            self._loop = None
+            raise self._erro
+
+
+    def encerra(self):
+        '''
+        Para o servidor e espera a thread terminar.
+        '''
+        if (self._loop is None): return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop = None
+
+
+    def __enter__(self):
+        self.inicia()
+        return self
+
+
+    def __exit__(self, *erro):
+        self.encerra()
+
+
+    # -------------------------------- Servidor ------------------------------ #
+
+    def _executa(self, pronto:threading.Event):
+        asyncio.set_event_loop(self._loop)
+        try:
+            servidor = self._loop.run_until_complete(
+                asyncio.start_server(self._atende, self.host, self.porta))
+            self.porta = servidor.sockets[0].getsockname()[1]
+        except Exception as erro:
+            self._erro = erro
+            self._loop.close()
+            return
+        finally:
+            pronto.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            servidor.close()
+            self._loop.run_until_complete(servidor.wait_closed())
+            self._loop.close()
+
+
+    async def _atende(self, reader:asyncio.StreamReader,
+                      writer:asyncio.StreamWriter):
+        try:
+            linha = (await reader.readline()).decode('latin-1').split()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            metodo, rota = linha[:2] if (len(linha) >= 2) else ('', '')
+            status, corpo = self._responde(metodo, rota.split('?')[0])
+            dados = json.dumps(corpo, ensure_ascii=False).encode()
+            writer.write(f'HTTP/1.1 {status}\r\n'
+                         'Content-Type: application/json; charset=utf-8\r\n'
+                         f'Content-Length: {len(dados)}\r\n'
+                         'Connection: close\r\n\r\n'.encode() + dados)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+    def _responde(self, metodo:str, rota:str):
+        rotas = {'/metricas': 'GET', '/parar': 'POST', '/checkpoint': 'POST'}
+        if (rota not in rotas):
+            return '404 Not Found', {'erro': f'rota desconhecida: {rota}'}
+        if (metodo != rotas[rota]):
+            return '405 Method Not Allowed', {'erro': f'use {rotas[rota]}'}
+        if (rota == '/parar'):
+            self.parar = True
+            return '202 Accepted', {'comando': 'parar'}
+        if (rota == '/checkpoint'):
+            self.checkpoint = True
+            return '202 Accepted', {'comando': 'checkpoint'}
+        return '200 OK', dict(self.instantaneo, memoria=memoria())
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Funções                                   #
+# ---------------------------------------------------------------------------- #
+
+def memoria():
+    '''
+    Uso de memória do processo, lido no momento da requisição.
+
+    Returns:
+        (dict): memória residente atual e máxima em bytes (None se não
+    disponível no sistema)
+    '''
+    atual, maxima = None, None
+    try:
+        with open('/proc/self/statm') as arquivo:
+            atual = int(arquivo.read().split()[1])*resource.getpagesize()
+    except (OSError, AttributeError):
+        pass
+    if (resource is not None):
+        maxima = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss é dado em kB, exceto no macOS:
+        if (sys.platform != 'darwin'): maxima *= 1024
+    return {'residente': atual, 'residenteMaxima': maxima}
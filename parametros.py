@@ -0,0 +1,73 @@
+# ---------------------------------------------------------------------------- #
+#                            Parâmetros da simulação                           #
+# ---------------------------------------------------------------------------- #
+
+# Propriedades dos indivíduos:
+propriedades = {
+    'Rato' : {
+        'raio':.15,
+        'massa':1,
+        'especie':'Rato',
+        'cor':(.5,.5,.5),
+        'corInf':(0,1,0),
+        'taxaNat':.09,
+        'taxaMort':.005,
+        'taxaInf':.15,
+        'taxaPred':.06,
+        'numIndividuosInicial':50,
+        'numIndividuos':0,
+        'numInfectados':0
+    },
+
+    'Coelho' : {
+        'raio':.2,
+        'massa':2,
+        'especie':'Coelho',
+        'cor':(1,1,1),
+        'taxaNat':.07,
+        'taxaMort':.001,
+        'taxaInf':0,
+        'taxaPred':.05,
+        'numIndividuosInicial':40,
+        'numIndividuos':0,
+        'numInfectados':0
+    },
+
+    'Gato' : {
+        'raio':.25,
+        'massa':3,
+        'especie':'Gato',
+        'cor':(1,.5,0),
+        'corInf':(.2,1,.2),
+        'taxaNat':.06,
+        'taxaMort':.0008,
+        'taxaInf':.1,
+        'taxaPred':.02,
+        'numIndividuosInicial':35,
+        'numIndividuos':0,
+        'numInfectados':0
+    },
+
+    'Leao' : {
+        'raio':.3,
+        'massa':4,
+        'especie':'Leao',
+        'cor':(1,1,0),
+        'corInf':(.4,1,.4),
+        'taxaNat':.005,
+        'taxaMort':.0009,
+        'taxaInf':.5,
+        'taxaPred':0,
+        'numIndividuosInicial':10,
+        'numIndividuos':0,
+        'numInfectados':0
+    }
+}
+
+dt = 1e-3 # Variação no tempo em cada frame
+velLimite = 20 # Limite de velocidade inicial para as partículas
+ladoCaixa = 20 # Lado da caixa imaginária contendo a simulação
+alcanceVizinhos = 2.5 # Distância, além do raio, para a lista de vizinhos
+
+# Pares (predador, presa):
+combosPred = [('Gato', 'Rato'), ('Gato', 'Coelho'), ('Leao', 'Gato')]
@@ -0,0 +1,156 @@
+# ---------------------------------------------------------------------------- #
+#                                  Importações                                 #
+# ---------------------------------------------------------------------------- #
+
+import argparse
+import os
+from time import perf_counter
+import numpy as np
+from backends import ESPECIES, EVENTOS, Backend, populacaoInicial, \
+selecionaBackend, BACKENDS
+from monitor import Monitor
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Funções                                   #
+# ---------------------------------------------------------------------------- #
+
+def simula(backend:Backend, passos:int, semente:int=None,
+           propriedades:dict=None, monitor:Monitor=None):
+    '''
+    Executa a simulação sem interface gráfica com o backend escolhido.
+
+    O frame 0 guarda a população inicial e o frame t, o número de indivíduos
+    no início do passo t, depois da remoção dos mortos, como em `main.step`.
+
+    Com um monitor, a cada `monitor.intervalo` frames o laço publica um
+    instantâneo (populações, infectados, passos por segundo e tempo médio por
+    passo da remoção dos mortos e de cada fase do backend) e atende aos
+    pedidos de parada e de checkpoint.
+
+    Args:
+        backend (Backend): backend de cálculo
+        passos (int): número de frames a simular
+        semente (int, optional): semente da população inicial e do backend
+        propriedades (dict, optional): propriedades das espécies. Por padrão,
+    as de `parametros`
+        monitor (Monitor, optional): monitor que acompanha a execução
+
+    Returns:
+        (dict): populações em 'conc' e infectados em 'inf', ambos (frames,
+    espécies); contagem de cada tipo de evento em 'eventos'; e, em 'extincao',
+    o primeiro frame em que cada espécie chegou a zero (NaN se não chegou)
+    '''
+    estado = populacaoInicial(semente, propriedades)
+    backend.semeia(semente)
+    conc = np.zeros((passos+1, len(ESPECIES)), dtype=np.int64)
+    inf = np.zeros((passos+1, len(ESPECIES)), dtype=np.int64)
+    conc[0], inf[0] = estado.numIndividuos, estado.numInfectados
+    intervalo = monitor.intervalo if monitor else passos+1
+    backend.tempos = dict.fromkeys(backend.FASES, 0.)
+    removeMortos = 0.
+    inicio = perf_counter()
+    t = 0
+    while (t < passos):
+        t += 1
+        t0 = perf_counter()
+        estado.removeMortos()
+        removeMortos += perf_counter()-t0
+        conc[t], inf[t] = estado.numIndividuos, estado.numInfectados
+        backend.passo(estado)
+        if (t % intervalo == 0):
+            fim = perf_counter()
+            tempos = dict(removeMortos=removeMortos, **backend.tempos)
+            monitor.publica(_instantaneo(backend, estado, t, passos,
+                                         intervalo/(fim-inicio),
+                                         {fase: tempo/intervalo for
+                                          fase, tempo in tempos.items()}))
+            backend.tempos = dict.fromkeys(backend.FASES, 0.)
+            removeMortos = 0.
+            if monitor.checkpoint:
+                monitor.checkpoint = False
+                if monitor.aoCheckpoint:
+                    monitor.aoCheckpoint(_resultado(conc[:t+1], inf[:t+1],
+                                                    estado))
+            if monitor.parar: break
+            inicio = perf_counter()
+    return _resultado(conc[:t+1], inf[:t+1], estado)
+
+
+def _resultado(conc:np.ndarray, inf:np.ndarray, estado):
+    extinta = conc == 0
+    extincao = np.where(extinta.any(axis=0), extinta.argmax(axis=0), np.nan)
+    return {'conc': conc, 'inf': inf, 'eventos': dict(estado.eventos),
+            'extincao': extincao}
+
+
+def _instantaneo(backend:Backend, estado, t:int, passos:int,
+                 passosPorSegundo:float, tempos:dict):
+    return {
+        'backend': backend.nome,
+        'frame': t,
+        'passos': passos,
+        'populacao': dict(zip(ESPECIES, estado.numIndividuos.tolist())),
+        'infectados': dict(zip(ESPECIES, estado.numInfectados.tolist())),
+        'eventos': dict(estado.eventos),
+        'passosPorSegundo': passosPorSegundo,
+        'temposPorPasso': tempos
+    }
+
+
+def exportaDados(resultado:dict, pasta:str='dados'):
+    '''
+    Grava o resultado nos mesmos arquivos e formato de `main.exportarDados`.
+
+    Args:
+        resultado (dict): resultado de `simula`
+        pasta (str, optional): pasta de destino. 'dados' por padrão
+    '''
+    conc, inf = resultado['conc'], resultado['inf']
+    tempo = np.arange(len(conc))[:, None]
+    colunasInf = [ESPECIES.index(esp) for esp in ('Rato', 'Gato', 'Leao')]
+    np.savetxt(os.path.join(pasta, 'dadosConcentracao.csv'),
+               np.hstack([tempo, conc]), delimiter=', ', fmt='% s')
+    np.savetxt(os.path.join(pasta, 'dadosInfeccao.csv'),
+               np.hstack([tempo, inf[:, colunasInf]]), delimiter=', ',
+               fmt='% s')
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Simulação                                  #
+# ---------------------------------------------------------------------------- #
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Simulação sem interface gráfica.')
+    parser.add_argument('--backend', choices=list(BACKENDS), default=None,
+                        help='backend de cálculo (padrão: '
+                             '$BIOMATEMATICA_BACKEND ou referencia)')
+    parser.add_argument('--passos', type=int, default=10000)
+    parser.add_argument('--semente', type=int, default=None)
+    parser.add_argument('--saida', default='dados',
+                        help='pasta dos CSVs de saída')
+    parser.add_argument('--monitor', type=int, default=None, metavar='PORTA',
+                        help='serve métricas em http://127.0.0.1:PORTA')
+    parser.add_argument('--intervalo', type=int, default=100,
+                        help='frames entre instantâneos do monitor')
+    args = parser.parse_args()
+    if (args.intervalo <= 0):
+        parser.error('--intervalo deve ser positivo')
+
+    backend = selecionaBackend(args.backend)
+    if (args.monitor is None):
+        resultado = simula(backend, args.passos, args.semente)
+    else:
+        with Monitor(porta=args.monitor, intervalo=args.intervalo,
+                     aoCheckpoint=lambda parcial: exportaDados(parcial,
+                                                               args.saida)
+                     ) as monitor:
+            print(f'\n--------- Monitor em http://{monitor.host}:'
+                  f'{monitor.porta}/metricas')
+            resultado = simula(backend, args.passos, args.semente,
+                               monitor=monitor)
+    exportaDados(resultado, args.saida)
+    print(f'\n\n--------- Fim da simulação ({backend.nome})!')
+    for evento in EVENTOS:
+        print(f'          {evento}: {resultado["eventos"][evento]}')